@@ -14,6 +14,9 @@ ssh ${SERVER_USER}@${SERVER_HOST} "mkdir -p ${REMOTE_TMP}"
 echo "📄 Kopiranje image_api.py..."
 scp server/image_api.py ${SERVER_USER}@${SERVER_HOST}:${REMOTE_TMP}/
 
+echo "📄 Kopiranje instrumentation.py..."
+scp server/instrumentation.py ${SERVER_USER}@${SERVER_HOST}:${REMOTE_TMP}/
+
 echo "📄 Kopiranje requirements.txt..."
 scp server/requirements.txt ${SERVER_USER}@${SERVER_HOST}:${REMOTE_TMP}/
 
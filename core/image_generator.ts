@@ -3,6 +3,7 @@ import https from 'https';
 import fs from 'fs';
 import path from 'path';
 import dotenv from 'dotenv';
+import { logServerTiming } from './server_timing';
 
 dotenv.config();
 
@@ -80,6 +81,7 @@ export class RemoteImageGenerator implements ImageService {
                 payload,
                 axiosConfig
             );
+            logServerTiming('RemoteImageGenerator', response.headers['server-timing']);
 
             const imageUrl = response.data.image_url;
             const fullImageUrl = imageUrl.startsWith('http')
@@ -2,6 +2,7 @@ import axios from 'axios';
 import dotenv from 'dotenv';
 import https from 'https';
 import http from 'http';
+import { logServerTiming } from './server_timing';
 
 dotenv.config();
 
@@ -89,6 +90,9 @@ export class LLMService {
             console.log(`[LLMService] 🕒 Response Received: ${new Date().toISOString()}`);
             console.log(`[LLMService] ⏱️  Duration: ${duration.toFixed(2)}s`);
             console.log(`[LLMService] 🔢 Status: ${response.status} ${response.statusText}`);
+            // Only server/llm_api.py (/v1/chat/completions) sends Server-Timing; the /generate server
+            // used here may not, in which case nothing is logged
+            logServerTiming('LLMService', response.headers['server-timing']);
             console.log(`[LLMService] ----------------------------------------------------------------\n`);
 
             // The response format from the simple endpoint might be different. 
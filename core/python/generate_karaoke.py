@@ -4,6 +4,7 @@ import json
 import torch
 import whisperx
 import math
+import time
 
 def to_ass_time(seconds):
     h = int(seconds // 3600)
@@ -11,31 +12,43 @@ def to_ass_time(seconds):
     s = seconds % 60
     return f"{h}:{m:02d}:{s:05.2f}"
 
-def generate_karaoke_ass(audio_path, output_ass_path, device="cpu"):
-    print(f"Loading WhisperX model on {device}...")
+def generate_karaoke_ass(audio_path, output_ass_path, device="cpu", model_size=None, language=None, timings=None):
+    """`language` skips language detection (and picks its alignment model); `timings` (dict) gets
+    per-stage seconds: model_load, transcribe, align_model_load, align, ass"""
+    model_size = model_size or os.getenv("WHISPERX_MODEL", "large-v2")
+    timings = timings if timings is not None else {}
+    print(f"Loading WhisperX model ({model_size}) on {device}...")
     
     # Load model
+    start = time.perf_counter()
     try:
         model = whisperx.load_model(
-            "large-v2", # v3 might be too heavy, v2 is standard good
+            model_size, # large-v2 by default; v3 might be too heavy, v2 is standard good
             device=device,
-            compute_type="int8" # CPU friendly
+            compute_type="int8", # CPU friendly
+            language=language
         )
     except Exception as e:
         print(f"Error loading model: {e}")
         return False
+    timings["model_load"] = time.perf_counter() - start
 
     print(f"Transcribing {audio_path}...")
+    start = time.perf_counter()
     audio = whisperx.load_audio(audio_path)
-    result = model.transcribe(audio, batch_size=4) # Smaller batch for CPU
+    result = model.transcribe(audio, batch_size=4, language=language) # Smaller batch for CPU
+    timings["transcribe"] = time.perf_counter() - start
 
     print("Aligning...")
     # Load alignment model
+    start = time.perf_counter()
     model_a, metadata = whisperx.load_align_model(
-        language_code=result["language"],
+        language_code=language or result["language"],
         device=device
     )
+    timings["align_model_load"] = time.perf_counter() - start
 
+    start = time.perf_counter()
     aligned_result = whisperx.align(
         result["segments"],
         model_a,
@@ -44,6 +57,8 @@ def generate_karaoke_ass(audio_path, output_ass_path, device="cpu"):
         device,
         return_char_alignments=False
     )
+    timings["align"] = time.perf_counter() - start
+    start = time.perf_counter()
 
     # Collect all words
     words = []
@@ -146,6 +161,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
 
     with open(output_ass_path, "w", encoding="utf-8") as f:
         f.write(header + "\n".join(ass_lines))
+    timings["ass"] = time.perf_counter() - start
         
     print(f"Generated ASS file: {output_ass_path}")
     return True
@@ -3,15 +3,21 @@ import json
 import sys
 import os
 
-def transcribe_audio(audio_path, output_path, device="cpu"):
-    print(f"Loading WhisperModel on {device}...")
-    try:
-        # Use 'tiny' or 'small' for speed on CPU, 'medium' for better accuracy
-        # int8 is faster on CPU
-        model = WhisperModel("small", device=device, compute_type="int8")
-    except Exception as e:
-        print(f"Error loading model: {e}")
-        return False
+def load_model(device="cpu", model_size=None):
+    model_size = model_size or os.getenv("WHISPER_MODEL", "small")
+    print(f"Loading WhisperModel ({model_size}) on {device}...")
+    # Use 'tiny' or 'small' for speed on CPU, 'medium' for better accuracy
+    # int8 is faster on CPU
+    return WhisperModel(model_size, device=device, compute_type="int8")
+
+def transcribe_audio(audio_path, output_path, device="cpu", model_size=None, model=None):
+    """Pass an already loaded `model` to reuse it across calls (e.g. benchmarks)"""
+    if model is None:
+        try:
+            model = load_model(device, model_size)
+        except Exception as e:
+            print(f"Error loading model: {e}")
+            return False
 
     print(f"Transcribing {audio_path}...")
     try:
@@ -0,0 +1,36 @@
+/**
+ * Parses the `Server-Timing` header returned by the Python services (server/instrumentation.py)
+ * e.g. "denoise;dur=41230.5, decode;dur=812.0, image_encode;dur=95.2, file_write;dur=3.1, total;dur=42200.4"
+ * into { denoise: 41230.5, decode: 812.0, ... } (milliseconds).
+ */
+export function parseServerTiming(header: unknown): Record<string, number> {
+    const timings: Record<string, number> = {};
+    if (typeof header !== 'string' || !header) {
+        return timings;
+    }
+
+    for (const part of header.split(',')) {
+        const [name, ...params] = part.trim().split(';');
+        for (const param of params) {
+            const [key, value] = param.trim().split('=');
+            if (name && key === 'dur' && value !== undefined) {
+                timings[name] = parseFloat(value);
+            }
+        }
+    }
+    return timings;
+}
+
+/**
+ * Logs per-stage timings so video build time can be attributed to each server-side stage.
+ */
+export function logServerTiming(tag: string, header: unknown): Record<string, number> {
+    const timings = parseServerTiming(header);
+    const stages = Object.entries(timings)
+        .map(([name, ms]) => `${name}=${(ms / 1000).toFixed(2)}s`)
+        .join(', ');
+    if (stages) {
+        console.log(`[${tag}] ⏱️  Server stages: ${stages}`);
+    }
+    return timings;
+}
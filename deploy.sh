@@ -52,6 +52,7 @@ ssh $SERVER "mkdir -p $REMOTE_DIR"
 # Step 3: Copy files to server
 echo -e "${GREEN}📤 Copying files to server...${NC}"
 scp server/llm_api.py $SERVER:$REMOTE_DIR/
+scp server/instrumentation.py $SERVER:$REMOTE_DIR/
 scp server/requirements.txt $SERVER:$REMOTE_DIR/
 scp server/.env $SERVER:$REMOTE_DIR/ 2>/dev/null || {
     echo -e "${YELLOW}⚠️  .env not found, copying env.example instead${NC}"
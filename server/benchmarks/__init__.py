@@ -0,0 +1 @@
+"""Offline benchmark suite for the Python services (LLM gateway, image API, core/python scripts)."""
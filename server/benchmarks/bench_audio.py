@@ -0,0 +1,148 @@
+"""Audio benchmark: transcription (transcribe_timestamp.py) and karaoke (generate_karaoke.py) time on synthetic audio.
+
+Synthetic audio is syllable-like tone bursts with pauses, so the models do the full decode and
+alignment work but usually find no words. Karaoke is therefore reported per stage (model load,
+transcribe, alignment model load, align) from generate_karaoke_ass(timings=...); the ASS stage and the
+end-to-end time are only reported for clips where words were found (e.g. --audio-clip speech.wav).
+The language is pinned (--audio-language) so the alignment model does not depend on what Whisper
+guesses for tones. Model loading is timed separately, so realtime_factor is processing time / clip length.
+"""
+import importlib
+import json
+import math
+import os
+import random
+import struct
+import tempfile
+import time
+import wave
+
+from .common import CORE_PYTHON_DIR, ensure_import_path, failed, metric, skipped
+
+SAMPLE_RATE = 16000
+
+def add_arguments(parser):
+    group = parser.add_argument_group("audio")
+    group.add_argument("--audio-durations", default="5,15,30", help="Comma separated clip lengths (s)")
+    group.add_argument("--whisper-model", default="tiny", help="faster-whisper model for transcription")
+    group.add_argument("--whisperx-model", default="tiny", help="WhisperX model for karaoke")
+    group.add_argument("--audio-language", default="en", help="Language for transcription and alignment model")
+    group.add_argument("--audio-clip", action="append", default=[],
+                       help="Speech WAV to benchmark as well (repeatable), e.g. a TTS output")
+
+def write_synthetic_audio(path, seconds, seed=0):
+    """16 kHz mono WAV: ~4 syllables/s of harmonic tone bursts with a varying pitch and short pauses"""
+    rng = random.Random(seed)
+    frames = bytearray()
+    t = 0.0
+    while t < seconds:
+        syllable = rng.uniform(0.12, 0.3)
+        pause = rng.uniform(0.03, 0.15) if rng.random() > 0.15 else rng.uniform(0.3, 0.6)
+        pitch = rng.uniform(110, 220)
+        n = int(syllable * SAMPLE_RATE)
+        for i in range(n):
+            envelope = math.sin(math.pi * i / n)
+            x = i / SAMPLE_RATE
+            sample = sum(math.sin(2 * math.pi * pitch * h * x) / h for h in (1, 2, 3))
+            frames += struct.pack("<h", int(8000 * envelope * sample / 1.8))
+        frames += b"\x00\x00" * int(pause * SAMPLE_RATE)
+        t += syllable + pause
+
+    frames = frames[: int(seconds * SAMPLE_RATE) * 2]
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(bytes(frames))
+
+def _import_script(name):
+    ensure_import_path(CORE_PYTHON_DIR)
+    return importlib.import_module(name)
+
+def _clip_duration(path):
+    with wave.open(path, "rb") as f:
+        return f.getnframes() / f.getframerate()
+
+def run(args):
+    with tempfile.TemporaryDirectory(prefix="bench_audio_") as workdir:
+        return _run(args, workdir)
+
+def _run(args, workdir):
+    durations = [float(d) for d in args.audio_durations.split(",") if d.strip()]
+    clips = {}
+    for duration in durations:
+        path = os.path.join(workdir, f"synthetic_{int(duration)}s.wav")
+        write_synthetic_audio(path, duration)
+        clips[f"{int(duration)}s"] = (path, duration)
+    for path in args.audio_clip:
+        # WAV only, so the duration can be read without extra dependencies
+        clips[os.path.splitext(os.path.basename(path))[0]] = (path, _clip_duration(path))
+
+    metrics = {}
+
+    try:
+        transcribe = _import_script("transcribe_timestamp")
+    except ImportError as e:
+        metrics["audio.transcribe"] = skipped(f"missing dependency: {e}")
+    else:
+        # Load once: transcribe_audio() would otherwise load the model inside every timed call
+        t0 = time.perf_counter()
+        try:
+            model = transcribe.load_model("cpu", args.whisper_model)
+        except Exception as e:
+            metrics["audio.transcribe"] = failed(f"could not load whisper model '{args.whisper_model}': {e}")
+        else:
+            metrics["audio.transcribe.model_load_seconds"] = metric(time.perf_counter() - t0, "s")
+            for label, (path, duration) in clips.items():
+                output = os.path.join(workdir, f"{label}.json")
+                t0 = time.perf_counter()
+                ok = transcribe.transcribe_audio(path, output, "cpu", model=model)
+                elapsed = time.perf_counter() - t0
+                if not ok:
+                    metrics[f"audio.transcribe.{label}"] = failed("transcribe_audio failed, see output above")
+                    continue
+                with open(output, "r", encoding="utf-8") as f:
+                    words = len(json.load(f))
+                prefix = f"audio.transcribe.{label}"
+                metrics[f"{prefix}.seconds"] = metric(elapsed, "s")
+                metrics[f"{prefix}.realtime_factor"] = metric(elapsed / duration, "x")
+                print(f"  transcribe {label}: {elapsed:.2f}s ({words} words)")
+
+    try:
+        karaoke = _import_script("generate_karaoke")
+    except ImportError as e:
+        metrics["audio.karaoke"] = skipped(f"missing dependency: {e}")
+    else:
+        for label, (path, duration) in clips.items():
+            output = os.path.join(workdir, f"{label}.ass")
+            timings = {}
+            t0 = time.perf_counter()
+            try:
+                ok = karaoke.generate_karaoke_ass(path, output, "cpu", model_size=args.whisperx_model,
+                                                  language=args.audio_language, timings=timings)
+            except Exception as e:
+                metrics[f"audio.karaoke.{label}"] = failed(f"generate_karaoke_ass raised: {e}")
+                continue
+            elapsed = time.perf_counter() - t0
+            if "model_load" not in timings:
+                metrics[f"audio.karaoke.{label}"] = failed(
+                    f"could not load WhisperX model '{args.whisperx_model}', see output above"
+                )
+                continue
+
+            # Returning False after alignment means "No words found!": every stage but the ASS one ran
+            prefix = f"audio.karaoke.{label}"
+            for stage in ("model_load", "transcribe", "align_model_load", "align", "ass"):
+                if stage in timings:
+                    metrics[f"{prefix}.{stage}_seconds"] = metric(timings[stage], "s")
+            processing = timings["transcribe"] + timings["align"] + timings.get("ass", 0.0)
+            metrics[f"{prefix}.realtime_factor"] = metric(processing / duration, "x")
+            if ok:
+                metrics[f"{prefix}.seconds"] = metric(elapsed, "s")
+            print(f"  karaoke {label}: {elapsed:.2f}s "
+                  f"(load {timings['model_load'] + timings['align_model_load']:.2f}s, "
+                  f"{'words found' if ok else 'no words found'})")
+
+    if all("skipped" in v for v in metrics.values()):
+        return skipped("; ".join(f"{k}: {v['skipped']}" for k, v in metrics.items()))
+    return metrics
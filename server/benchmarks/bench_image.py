@@ -0,0 +1,178 @@
+"""Image API benchmark: seconds per image across step counts and batch sizes.
+
+By default a tiny randomly initialised Stable Diffusion pipeline is built in memory, so nothing is
+downloaded. Pass --image-model real to benchmark IMAGE_MODEL through image_api.get_pipeline() instead
+(the model must already be in the local HF cache when running offline).
+"""
+import json
+import os
+import tempfile
+import time
+
+from .common import SERVER_DIR, ensure_import_path, failed, metric, parse_server_timing, skipped
+
+def add_arguments(parser):
+    group = parser.add_argument_group("image")
+    group.add_argument("--image-model", choices=["tiny", "real"], default="tiny")
+    group.add_argument("--image-steps", default="1,4,8", help="Comma separated num_inference_steps")
+    group.add_argument("--image-batch", default="1,2,4", help="Comma separated batch sizes")
+    group.add_argument("--image-size", type=int, default=64, help="Width/height in pixels")
+    group.add_argument("--image-repeats", type=int, default=3)
+
+def _tiny_tokenizer(directory):
+    """Character level CLIP tokenizer (empty merges) so no vocab has to be downloaded"""
+    from transformers import CLIPTokenizer
+    from transformers.models.clip.tokenization_clip import bytes_to_unicode
+
+    chars = list(bytes_to_unicode().values())
+    vocab = {"<|startoftext|>": 0, "<|endoftext|>": 1}
+    for token in chars + [c + "</w>" for c in chars]:
+        vocab.setdefault(token, len(vocab))
+
+    vocab_file = os.path.join(directory, "vocab.json")
+    merges_file = os.path.join(directory, "merges.txt")
+    with open(vocab_file, "w", encoding="utf-8") as f:
+        json.dump(vocab, f)
+    with open(merges_file, "w", encoding="utf-8") as f:
+        f.write("#version: 0.2\n")
+
+    tokenizer = CLIPTokenizer(vocab_file, merges_file, model_max_length=77, pad_token="<|endoftext|>")
+    return tokenizer, len(vocab)
+
+def build_tiny_pipeline():
+    import torch
+    from diffusers import AutoencoderKL, DDIMScheduler, StableDiffusionPipeline, UNet2DConditionModel
+    from transformers import CLIPTextConfig, CLIPTextModel
+
+    torch.manual_seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        tokenizer, vocab_size = _tiny_tokenizer(tmp)
+
+    unet = UNet2DConditionModel(
+        block_out_channels=(32, 64),
+        layers_per_block=2,
+        sample_size=32,
+        in_channels=4,
+        out_channels=4,
+        down_block_types=("DownBlock2D", "CrossAttnDownBlock2D"),
+        up_block_types=("CrossAttnUpBlock2D", "UpBlock2D"),
+        cross_attention_dim=32,
+    )
+    vae = AutoencoderKL(
+        block_out_channels=[32, 64],
+        in_channels=3,
+        out_channels=3,
+        down_block_types=["DownEncoderBlock2D", "DownEncoderBlock2D"],
+        up_block_types=["UpDecoderBlock2D", "UpDecoderBlock2D"],
+        latent_channels=4,
+    )
+    text_encoder = CLIPTextModel(CLIPTextConfig(
+        bos_token_id=0,
+        eos_token_id=1,
+        pad_token_id=1,
+        hidden_size=32,
+        intermediate_size=37,
+        num_attention_heads=4,
+        num_hidden_layers=5,
+        vocab_size=vocab_size,
+    ))
+    scheduler = DDIMScheduler(
+        beta_start=0.00085,
+        beta_end=0.012,
+        beta_schedule="scaled_linear",
+        clip_sample=False,
+        set_alpha_to_one=False,
+    )
+    return StableDiffusionPipeline(
+        vae=vae,
+        text_encoder=text_encoder,
+        tokenizer=tokenizer,
+        unet=unet,
+        scheduler=scheduler,
+        safety_checker=None,
+        feature_extractor=None,
+        requires_safety_checker=False,
+    )
+
+def run(args):
+    # image_api reads IMAGE_OUTPUT_DIR (and creates it) at import time, so point it at a temp dir first
+    with tempfile.TemporaryDirectory(prefix="bench_images_") as output_dir:
+        previous = os.environ.get("IMAGE_OUTPUT_DIR")
+        os.environ["IMAGE_OUTPUT_DIR"] = output_dir
+        try:
+            return _run(args, output_dir)
+        finally:
+            if previous is None:
+                os.environ.pop("IMAGE_OUTPUT_DIR", None)
+            else:
+                os.environ["IMAGE_OUTPUT_DIR"] = previous
+
+def _run(args, output_dir):
+    try:
+        import torch  # noqa: F401
+        import diffusers  # noqa: F401
+        import transformers  # noqa: F401
+        from fastapi.testclient import TestClient
+        ensure_import_path(SERVER_DIR)
+        import image_api
+    except ImportError as e:
+        return skipped(f"missing dependency: {e}")
+    image_api.OUTPUT_DIR = output_dir
+
+    metrics = {}
+    start = time.perf_counter()
+    if args.image_model == "tiny":
+        image_api._pipeline = build_tiny_pipeline().to(image_api.DEVICE)
+        pipeline = image_api._pipeline
+    else:
+        try:
+            pipeline = image_api.get_pipeline()
+        except Exception as e:
+            return {"image.model_load": failed(f"could not load {image_api.MODEL_ID}: {e}")}
+    metrics["image.model_load_s"] = metric(time.perf_counter() - start, "s")
+    pipeline.set_progress_bar_config(disable=True)
+
+    size = args.image_size
+    prompt = image_api.enhance_prompt_with_style("dog with a red hat", "simple_cartoon")
+
+    # Warm-up so the first measurement does not include lazy init / allocator growth
+    pipeline(prompt=prompt, num_inference_steps=1, width=size, height=size)
+
+    for steps in [int(s) for s in args.image_steps.split(",") if s.strip()]:
+        for batch in [int(b) for b in args.image_batch.split(",") if b.strip()]:
+            timings = []
+            for _ in range(args.image_repeats):
+                t0 = time.perf_counter()
+                pipeline(prompt=prompt, num_inference_steps=steps, width=size, height=size,
+                         num_images_per_prompt=batch)
+                timings.append(time.perf_counter() - t0)
+            best = min(timings)
+            metrics[f"image.steps{steps}.batch{batch}.s_per_image"] = metric(best / batch, "s")
+            metrics[f"image.steps{steps}.batch{batch}.s_per_step"] = metric(best / steps, "s")
+            print(f"  steps={steps} batch={batch}: {best / batch:.3f}s/image")
+
+    # End to end through the HTTP endpoint (prompt handling, PNG encode, file write)
+    client = TestClient(image_api.app)
+    steps = min(int(s) for s in args.image_steps.split(",") if s.strip())
+    timings = []
+    stages = {}
+    for i in range(args.image_repeats):
+        t0 = time.perf_counter()
+        response = client.post(
+            "/generate-image",
+            json={"prompt": "dog with a red hat", "width": size, "height": size,
+                  "num_inference_steps": steps, "seed": i},
+            headers={"X-API-Key": image_api.API_KEY},
+        )
+        if response.status_code != 200:
+            # Keep the pipeline metrics above; the endpoint ones go missing and the error fails the run
+            metrics["image.endpoint"] = failed(f"/generate-image returned {response.status_code}: {response.text}")
+            return metrics
+        timings.append(time.perf_counter() - t0)
+        for name, ms in parse_server_timing(response.headers.get("server-timing", "")).items():
+            stages.setdefault(name, []).append(ms)
+    metrics[f"image.endpoint.steps{steps}.s_per_request"] = metric(min(timings), "s")
+    for name, values in stages.items():
+        metrics[f"image.endpoint.steps{steps}.stage.{name}_ms"] = metric(min(values), "ms")
+
+    return metrics
@@ -0,0 +1,98 @@
+"""LLM gateway benchmark: throughput, p50/p99 latency and concurrency of llm_api.py against a fake Ollama."""
+import asyncio
+import time
+
+from .common import (
+    SERVER_DIR, ServerThread, ensure_import_path, failed, metric, parse_server_timing, percentile, skipped,
+)
+
+def add_arguments(parser):
+    group = parser.add_argument_group("llm")
+    group.add_argument("--llm-requests", type=int, default=200, help="Requests per concurrency level")
+    group.add_argument("--llm-concurrency", default="1,8,32", help="Comma separated concurrency levels")
+    group.add_argument("--ollama-latency", type=float, default=0.05, help="Fake Ollama time to first token (s)")
+    group.add_argument("--ollama-token-latency", type=float, default=0.002, help="Fake Ollama time per token (s)")
+    group.add_argument("--ollama-tokens", type=int, default=32, help="Tokens per fake completion")
+
+async def _load(url, api_key, total, concurrency):
+    import httpx
+
+    latencies = []
+    overheads = []
+    errors = []
+    semaphore = asyncio.Semaphore(concurrency)
+    payload = {"messages": [{"role": "user", "content": "Tell me a scary story."}], "max_tokens": None}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=120.0, limits=limits) as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.post(f"{url}/v1/chat/completions", json=payload,
+                                                 headers={"X-API-Key": api_key})
+                    if response.status_code != 200:
+                        errors.append(f"HTTP {response.status_code}: {response.text[:200]}")
+                        return
+                except httpx.HTTPError as e:
+                    errors.append(f"{type(e).__name__}: {e}")
+                    return
+                latencies.append(time.perf_counter() - start)
+                # Time the gateway spends outside the upstream call, from its Server-Timing header
+                timing = parse_server_timing(response.headers.get("server-timing", ""))
+                if "total" in timing and "ollama" in timing:
+                    overheads.append(timing["total"] - timing["ollama"])
+
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        wall = time.perf_counter() - wall_start
+
+    return latencies, overheads, errors, wall
+
+def run(args):
+    try:
+        import httpx  # noqa: F401
+        import uvicorn  # noqa: F401
+        from .fake_ollama import create_app
+        ensure_import_path(SERVER_DIR)
+        import llm_api
+    except ImportError as e:
+        return skipped(f"missing dependency: {e}")
+
+    fake_app = create_app(args.ollama_latency, args.ollama_token_latency, args.ollama_tokens)
+    metrics = {}
+
+    with ServerThread(fake_app) as ollama:
+        llm_api.OLLAMA_BASE_URL = ollama.url
+        with ServerThread(llm_api.app) as gateway:
+            print(f"📡 Fake Ollama: {ollama.url}  🚀 Gateway: {gateway.url}")
+
+            # Warm up connections and the event loop
+            asyncio.run(_load(gateway.url, llm_api.API_KEY, 5, 1))
+
+            for concurrency in [int(c) for c in args.llm_concurrency.split(",") if c.strip()]:
+                fake_app.state.stats["max_in_flight"] = 0
+                latencies, overheads, errors, wall = asyncio.run(
+                    _load(gateway.url, llm_api.API_KEY, args.llm_requests, concurrency)
+                )
+                prefix = f"llm.gateway.c{concurrency}"
+                if errors or not latencies:
+                    # No zeroed latencies: they would read as an improvement against the baseline
+                    metrics[prefix] = failed(
+                        f"{len(errors)}/{args.llm_requests} requests failed, first: {errors[0] if errors else '-'}"
+                    )
+                    print(f"  c={concurrency}: {len(errors)} errors")
+                    continue
+                metrics[f"{prefix}.throughput_rps"] = metric(len(latencies) / wall if wall else 0, "req/s", "higher")
+                metrics[f"{prefix}.p50_ms"] = metric(percentile(latencies, 50) * 1000, "ms")
+                metrics[f"{prefix}.p99_ms"] = metric(percentile(latencies, 99) * 1000, "ms")
+                if overheads:
+                    metrics[f"{prefix}.gateway_overhead_p50_ms"] = metric(percentile(overheads, 50), "ms")
+                metrics[f"{prefix}.upstream_max_in_flight"] = metric(
+                    fake_app.state.stats["max_in_flight"], "count", "higher"
+                )
+                print(f"  c={concurrency}: {metrics[f'{prefix}.throughput_rps']['value']:.1f} req/s, "
+                      f"p50={metrics[f'{prefix}.p50_ms']['value']:.1f}ms, "
+                      f"p99={metrics[f'{prefix}.p99_ms']['value']:.1f}ms")
+
+    return metrics
@@ -0,0 +1,106 @@
+import json
+import os
+import platform
+import socket
+import sys
+import threading
+import time
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORE_PYTHON_DIR = os.path.join(os.path.dirname(SERVER_DIR), "core", "python")
+
+def percentile(values, pct):
+    """Linear-interpolated percentile (pct in 0-100) of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+def metric(value, unit, better="lower"):
+    """Single machine-readable measurement; `better` tells compare.py which direction is a regression"""
+    return {"value": round(float(value), 6), "unit": unit, "better": better}
+
+def skipped(reason):
+    """Marker returned by a suite when its dependencies or models are not available"""
+    return {"skipped": reason}
+
+def failed(reason):
+    """Marker for a measurement that ran and broke; always fails the run, with or without a baseline"""
+    return {"error": reason}
+
+def parse_server_timing(header):
+    """'ollama;dur=812.4, total;dur=815.1' -> {"ollama": 812.4, "total": 815.1}"""
+    timings = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if name and key == "dur":
+                timings[name] = float(value)
+    return timings
+
+def environment_info():
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    try:
+        import torch
+        info["torch"] = torch.__version__
+        info["torch_threads"] = torch.get_num_threads()
+    except ImportError:
+        pass
+    return info
+
+def ensure_import_path(path):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+class ServerThread:
+    """Run an ASGI app with uvicorn in a background thread (used for the fake Ollama and the gateway)"""
+
+    def __init__(self, app, port=None):
+        import uvicorn
+        self.port = port or free_port()
+        config = uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning", access_log=False)
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.thread.start()
+        deadline = time.time() + 10
+        while not self.server.started:
+            if time.time() > deadline or not self.thread.is_alive():
+                raise RuntimeError(f"Server on port {self.port} did not start")
+            time.sleep(0.02)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+def write_results(results, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,88 @@
+"""Compare a benchmark results file against a stored baseline.
+
+    python -m benchmarks.compare benchmarks/results/latest.json benchmarks/baseline.json --threshold 0.1
+
+Exits with status 1 if any metric regressed by more than the threshold, if a baseline metric is
+missing from the current run (e.g. its suite was skipped) or if the current run recorded errors.
+"""
+import argparse
+import sys
+
+from .common import load_results
+
+def compare(current, baseline, threshold=0.1, allow_missing=False):
+    """Return (rows, regressions). Each row: (name, baseline, current, change, status)"""
+    rows = []
+    regressions = []
+    current_metrics = current.get("metrics", {})
+    baseline_metrics = baseline.get("metrics", {})
+
+    for name in sorted(set(current_metrics) | set(baseline_metrics)):
+        cur = current_metrics.get(name)
+        base = baseline_metrics.get(name)
+        if not cur or "value" not in cur:
+            rows.append((name, base and base.get("value"), None, None, "missing"))
+            if not allow_missing:
+                regressions.append(name)
+            continue
+        if not base or "value" not in base:
+            rows.append((name, None, cur["value"], None, "new"))
+            continue
+
+        if base["value"] == 0:
+            change = 0.0 if cur["value"] == 0 else float("inf")
+        else:
+            change = (cur["value"] - base["value"]) / abs(base["value"])
+        worse = change > threshold if cur.get("better", "lower") == "lower" else change < -threshold
+        better = change < -threshold if cur.get("better", "lower") == "lower" else change > threshold
+        status = "REGRESSION" if worse else "improved" if better else "ok"
+        if worse:
+            regressions.append(name)
+        rows.append((name, base["value"], cur["value"], change, status))
+
+    return rows, regressions
+
+def print_report(rows):
+    width = max([len(r[0]) for r in rows] + [6])
+    print(f"{'metric'.ljust(width)}  {'baseline':>12}  {'current':>12}  {'change':>8}  status")
+    for name, base, cur, change, status in rows:
+        fmt = lambda v: f"{v:12.4f}" if isinstance(v, (int, float)) else f"{'-':>12}"
+        pct = f"{change * 100:+7.1f}%" if change is not None and change != float("inf") else f"{'-':>8}"
+        print(f"{name.ljust(width)}  {fmt(base)}  {fmt(cur)}  {pct}  {status}")
+
+def report(current, baseline, threshold=0.1, allow_missing=False):
+    """Print the comparison (baseline may be None) and return the exit code shared by run.py and compare.py"""
+    failures = 0
+    errors = current.get("errors", {})
+    for name, reason in errors.items():
+        print(f"❌ {name} failed: {reason}")
+    failures += len(errors)
+
+    if baseline is not None:
+        rows, regressions = compare(current, baseline, threshold, allow_missing)
+        print_report(rows)
+        failures += len(regressions)
+        if regressions:
+            missing = sum(1 for row in rows if row[0] in regressions and row[4] == "missing")
+            print(f"\n❌ {len(regressions) - missing} metric(s) regressed by more than {threshold:.0%}, "
+                  f"{missing} baseline metric(s) missing")
+
+    if failures:
+        return 1
+    if baseline is not None:
+        print(f"\n✅ No regressions beyond {threshold:.0%}")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare benchmark results against a baseline")
+    parser.add_argument("current")
+    parser.add_argument("baseline")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed relative regression (0.1 = 10%%)")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="Do not fail on baseline metrics missing from the current run")
+    args = parser.parse_args(argv)
+
+    return report(load_results(args.current), load_results(args.baseline), args.threshold, args.allow_missing)
+
+if __name__ == "__main__":
+    sys.exit(main())
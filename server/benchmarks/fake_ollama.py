@@ -0,0 +1,82 @@
+"""Fake Ollama server with configurable latency, used as the upstream for LLM gateway benchmarks.
+
+Run standalone:
+    python -m benchmarks.fake_ollama --port 11434 --latency 0.05 --token-latency 0.005
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+def create_app(latency=0.05, token_latency=0.005, tokens=32, model="llama3.1:8b"):
+    """latency: time before the first token, token_latency: time per generated token"""
+    app = FastAPI(title="Fake Ollama", version="1.0.0")
+    stats = {"requests": 0, "in_flight": 0, "max_in_flight": 0}
+    app.state.stats = stats
+
+    def created_at():
+        return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": model, "modified_at": created_at(), "size": 0}]}
+
+    @app.get("/_stats")
+    async def get_stats():
+        return stats
+
+    @app.post("/api/chat")
+    async def chat(request: Request):
+        payload = await request.json()
+        num_tokens = payload.get("options", {}).get("num_predict") or tokens
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+
+        if payload.get("stream", True):
+            async def stream():
+                try:
+                    await asyncio.sleep(latency)
+                    for i in range(num_tokens):
+                        chunk = {
+                            "model": payload.get("model", model),
+                            "created_at": created_at(),
+                            "message": {"role": "assistant", "content": f"tok{i} "},
+                            "done": False,
+                        }
+                        yield json.dumps(chunk) + "\n"
+                        await asyncio.sleep(token_latency)
+                    yield json.dumps({"model": payload.get("model", model), "created_at": created_at(),
+                                      "message": {"role": "assistant", "content": ""},
+                                      "done": True, "eval_count": num_tokens}) + "\n"
+                finally:
+                    stats["in_flight"] -= 1
+            return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+        try:
+            await asyncio.sleep(latency + token_latency * num_tokens)
+        finally:
+            stats["in_flight"] -= 1
+        return {
+            "model": payload.get("model", model),
+            "created_at": created_at(),
+            "message": {"role": "assistant", "content": " ".join(f"tok{i}" for i in range(num_tokens))},
+            "done": True,
+            "eval_count": num_tokens,
+        }
+
+    return app
+
+if __name__ == "__main__":
+    import uvicorn
+    parser = argparse.ArgumentParser(description="Fake Ollama server")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--token-latency", type=float, default=0.005)
+    parser.add_argument("--tokens", type=int, default=32)
+    args = parser.parse_args()
+    print(f"🤖 Fake Ollama on port {args.port} (latency={args.latency}s, token_latency={args.token_latency}s)")
+    uvicorn.run(create_app(args.latency, args.token_latency, args.tokens), host="0.0.0.0", port=args.port)
@@ -0,0 +1,88 @@
+"""Run the offline benchmark suite and optionally compare against a stored baseline.
+
+    cd server
+    python -m benchmarks.run                        # all suites, compare with benchmarks/baseline.json
+    python -m benchmarks.run --suites llm           # only the LLM gateway
+    python -m benchmarks.run --save-baseline        # store this run as the new baseline
+"""
+import argparse
+import os
+import sys
+import time
+
+from . import bench_audio, bench_image, bench_llm
+from .common import environment_info, load_results, write_results
+from .compare import report
+
+SUITES = {
+    "llm": bench_llm,
+    "image": bench_image,
+    "audio": bench_audio,
+}
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results", "latest.json")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="tt-printer Python services benchmark")
+    parser.add_argument("--suites", default=",".join(SUITES), help="Comma separated: " + ", ".join(SUITES))
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run to --baseline")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed relative regression (0.1 = 10%%)")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="Do not fail on baseline metrics missing from this run (e.g. a skipped suite)")
+    parser.add_argument("--allow-download", action="store_true",
+                        help="Allow Hugging Face downloads (default: offline, cached models only)")
+    for module in SUITES.values():
+        module.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if not args.allow_download:
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+    results = {"environment": environment_info(), "metrics": {}, "skipped": {}, "errors": {}, "config": vars(args)}
+
+    for name in [s.strip() for s in args.suites.split(",") if s.strip()]:
+        if name not in SUITES:
+            parser.error(f"Unknown suite: {name}")
+        print(f"⏱️  Running {name} benchmark...")
+        start = time.perf_counter()
+        suite_result = SUITES[name].run(args)
+        if "skipped" in suite_result:
+            print(f"⚠️  {name} skipped: {suite_result['skipped']}")
+            results["skipped"][name] = suite_result["skipped"]
+            continue
+        for metric_name, value in suite_result.items():
+            if "skipped" in value:
+                print(f"⚠️  {metric_name} skipped: {value['skipped']}")
+                results["skipped"][metric_name] = value["skipped"]
+            elif "error" in value:
+                print(f"❌ {metric_name} failed: {value['error']}")
+                results["errors"][metric_name] = value["error"]
+            else:
+                results["metrics"][metric_name] = value
+        print(f"✅ {name} done in {time.perf_counter() - start:.1f}s")
+
+    write_results(results, args.output)
+    print(f"📁 Results written to {args.output}")
+
+    if args.save_baseline:
+        if results["errors"]:
+            print("❌ Not saving a baseline from a run with errors")
+            return report(results, None)
+        write_results(results, args.baseline)
+        print(f"📌 Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        baseline = load_results(args.baseline)
+    else:
+        print(f"ℹ️  No baseline at {args.baseline}, run with --save-baseline to create one")
+    return report(results, baseline, args.threshold, args.allow_missing)
+
+if __name__ == "__main__":
+    sys.exit(main())
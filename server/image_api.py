@@ -2,8 +2,12 @@ from fastapi import FastAPI, HTTPException, Header, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
+import asyncio
+import inspect
 import os
+import time
 import uuid
 from dotenv import load_dotenv
 import torch
@@ -11,6 +15,7 @@ from diffusers import StableDiffusionPipeline, DiffusionPipeline
 from PIL import Image
 import io
 import base64
+from instrumentation import instrument, instrument_torch, observe_stage, queued, record_stage, stage
 
 load_dotenv()
 
@@ -23,8 +28,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Prometheus /metrics + Server-Timing headers
+instrument(app, "image_api")
+instrument_torch(torch)
+
 # Configuration
 API_KEY = os.getenv("API_KEY", "tt-printer-secret-key-2025")
 MODEL_ID = os.getenv("IMAGE_MODEL", "runwayml/stable-diffusion-v1-5")
@@ -38,12 +48,16 @@ os.makedirs(OUTPUT_DIR, exist_ok=True)
 # Global model instance (lazy loaded)
 _pipeline = None
 
+# Pipelines are not thread safe: one generation at a time, the rest wait in the "pipeline" queue
+_pipeline_lock = asyncio.Lock()
+
 def get_pipeline():
     """Lazy load the image generation pipeline (supports SD and Flux)"""
     global _pipeline
     if _pipeline is None:
         print(f"Loading model: {MODEL_ID}")
         print("This may take a few minutes on first load...")
+        load_start = time.perf_counter()
         
         try:
             # Check if it's Flux model (contains 'flux' in name)
@@ -79,6 +93,7 @@ def get_pipeline():
                     _pipeline = StableDiffusionPipeline.from_pretrained(MODEL_ID)
                     _pipeline = _pipeline.to(DEVICE)
             
+            record_stage("model_load", time.perf_counter() - load_start)
             print("Model loaded successfully!")
         except Exception as e:
             print(f"Error loading model: {e}")
@@ -86,6 +101,40 @@ def get_pipeline():
     
     return _pipeline
 
+def run_pipeline(pipeline, **kwargs):
+    """Run the pipeline, recording denoise (prompt encode + steps) and decode (VAE + postprocess) stages"""
+    start = time.perf_counter()
+    last_step = start
+
+    def mark_step():
+        nonlocal last_step
+        now = time.perf_counter()
+        observe_stage("denoise_step", now - last_step)
+        last_step = now
+
+    params = inspect.signature(pipeline.__call__).parameters
+    if "callback_on_step_end" in params:
+        def on_step_end(pipe, step, timestep, callback_kwargs):
+            mark_step()
+            return callback_kwargs
+        kwargs["callback_on_step_end"] = on_step_end
+    elif "callback" in params:
+        # Older diffusers
+        kwargs["callback"] = lambda step, timestep, latents: mark_step()
+        kwargs["callback_steps"] = 1
+
+    result = pipeline(**kwargs)
+    end = time.perf_counter()
+    if last_step > start:
+        record_stage("denoise", last_step - start)
+        record_stage("decode", end - last_step)
+    else:
+        record_stage("inference", end - start)
+    return result
+
+def load_and_run_pipeline(**kwargs):
+    return run_pipeline(get_pipeline(), **kwargs)
+
 # Request/Response models
 class ImageGenerationRequest(BaseModel):
     prompt: str
@@ -138,28 +187,38 @@ async def generate_image(
         print(f"Generating image with prompt: {enhanced_prompt[:100]}...")
         print(f"Style: {request.style}, Steps: {request.num_inference_steps}")
         
-        # Get pipeline
-        pipeline = get_pipeline()
-        
         # Generate image
         generator = None
         if request.seed is not None:
             generator = torch.Generator(device=DEVICE).manual_seed(request.seed)
         
-        image = pipeline(
-            prompt=enhanced_prompt,
-            negative_prompt=negative_prompt,
-            num_inference_steps=request.num_inference_steps,
-            width=request.width,
-            height=request.height,
-            generator=generator
-        ).images[0]
+        # Run in a worker thread so /health and /metrics stay responsive during generation
+        with queued("pipeline"):
+            await _pipeline_lock.acquire()
+        try:
+            result = await run_in_threadpool(
+                load_and_run_pipeline,
+                prompt=enhanced_prompt,
+                negative_prompt=negative_prompt,
+                num_inference_steps=request.num_inference_steps,
+                width=request.width,
+                height=request.height,
+                generator=generator
+            )
+        finally:
+            _pipeline_lock.release()
+        image = result.images[0]
         
         # Save image
         image_id = str(uuid.uuid4())
         image_filename = f"{image_id}.png"
         image_path = os.path.join(OUTPUT_DIR, image_filename)
-        image.save(image_path)
+        with stage("image_encode"):
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG")
+        with stage("file_write"):
+            with open(image_path, "wb") as f:
+                f.write(buffer.getvalue())
         
         # Get seed used
         used_seed = request.seed if request.seed is not None else generator.initial_seed() if generator else 0
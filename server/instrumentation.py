@@ -0,0 +1,158 @@
+"""Shared instrumentation for the FastAPI services (llm_api.py, image_api.py).
+
+- Prometheus /metrics: request counts, latency histograms, in-flight, upstream in-flight and queue gauges,
+  per-stage durations, process RSS/CPU (prometheus_client process collector), process thread count
+  and torch thread pool sizes
+- Per-stage spans: `with stage("ollama"): ...` records into the stage histogram and into the
+  current request, and the request's stages are returned in a `Server-Timing` response header:
+
+      Server-Timing: ollama;dur=812.4, total;dur=815.1
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from fastapi import FastAPI, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# CPU inference can take minutes, so buckets go well past the usual web defaults
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled", ["service", "method", "path", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["service", "method", "path"],
+    buckets=LATENCY_BUCKETS,
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being handled", ["service"])
+QUEUE_DEPTH = Gauge("queue_depth", "Requests waiting on a shared resource", ["service", "queue"])
+UPSTREAM_IN_FLIGHT = Gauge(
+    "upstream_requests_in_flight", "Outstanding calls to an upstream service", ["service", "upstream"]
+)
+STAGE_LATENCY = Histogram(
+    "stage_duration_seconds", "Time spent in a processing stage", ["service", "stage"],
+    buckets=LATENCY_BUCKETS,
+)
+TORCH_THREAD_POOL_SIZE = Gauge("torch_thread_pool_size", "Configured torch thread pool sizes", ["kind"])
+PROCESS_THREADS = Gauge("process_threads", "OS threads currently alive in this process (torch, uvicorn, workers)")
+
+# Stage timings (ms) of the request being handled, None outside a request
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+# Service label for stages; set per request by the middleware, instrument() sets the default
+_service: ContextVar[str] = ContextVar("service", default="unknown")
+
+def observe_stage(name: str, seconds: float):
+    """Record into the stage histogram only (not the Server-Timing header), e.g. per denoise step"""
+    STAGE_LATENCY.labels(_service.get(), name).observe(seconds)
+
+def record_stage(name: str, seconds: float):
+    """Record a stage duration that was measured elsewhere (e.g. from a callback)"""
+    observe_stage(name, seconds)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds * 1000
+
+@contextmanager
+def stage(name: str):
+    """Time a block as a named stage of the current request"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - start)
+
+@contextmanager
+def queued(name: str):
+    """Count the block as waiting in the named queue"""
+    gauge = QUEUE_DEPTH.labels(_service.get(), name)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+@contextmanager
+def upstream_call(name: str):
+    """Count the block as an outstanding call to the named upstream (served or waiting there, we can't tell)"""
+    gauge = UPSTREAM_IN_FLIGHT.labels(_service.get(), name)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+def _count_process_threads() -> int:
+    # /proc/self/task has one entry per OS thread, including torch's native OpenMP workers
+    # that threading.active_count() cannot see
+    try:
+        return len(os.listdir("/proc/self/task"))
+    except OSError:
+        return threading.active_count()
+
+PROCESS_THREADS.set_function(_count_process_threads)
+
+def instrument_torch(torch):
+    """Expose configured torch intra-op / inter-op pool sizes (passed in so this module does not import torch)"""
+    TORCH_THREAD_POOL_SIZE.labels("intra_op").set_function(torch.get_num_threads)
+    TORCH_THREAD_POOL_SIZE.labels("inter_op").set_function(torch.get_num_interop_threads)
+
+def server_timing_header(timings: Dict[str, float], total_ms: float) -> str:
+    parts = [f"{name};dur={ms:.1f}" for name, ms in timings.items()]
+    parts.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(parts)
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: request metrics + Server-Timing header with the request's stages"""
+
+    def __init__(self, app, service: str):
+        self.app = app
+        self.service = service
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: Dict[str, float] = {}
+        token = _request_timings.set(timings)
+        service_token = _service.set(self.service)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                total_ms = (time.perf_counter() - start) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing_header(timings, total_ms).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        in_flight = IN_FLIGHT.labels(self.service)
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            _request_timings.reset(token)
+            _service.reset(service_token)
+            # Route template keeps label cardinality bounded (/images/{filename}, not every file)
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            REQUESTS.labels(self.service, scope["method"], path, str(status)).inc()
+            REQUEST_LATENCY.labels(self.service, scope["method"], path).observe(time.perf_counter() - start)
+
+def instrument(app: FastAPI, service: str):
+    """Add request metrics, Server-Timing headers and a /metrics endpoint to a FastAPI app"""
+    _service.set(service)
+    IN_FLIGHT.labels(service)
+    app.add_middleware(MetricsMiddleware, service=service)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
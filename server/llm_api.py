@@ -5,6 +5,7 @@ from typing import Optional, List
 import httpx
 import os
 from dotenv import load_dotenv
+from instrumentation import instrument, stage, upstream_call
 
 load_dotenv()
 
@@ -17,8 +18,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Prometheus /metrics + Server-Timing headers
+instrument(app, "llm_api")
+
 # Configuration
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 API_KEY = os.getenv("API_KEY", "tt-printer-secret-key-2025")  # Promeni ovo!
@@ -67,7 +72,8 @@ async def health():
 async def list_models(api_key: str = Depends(verify_api_key)):
     try:
         async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{OLLAMA_BASE_URL}/api/tags")
+            with upstream_call("ollama"), stage("ollama"):
+                response = await client.get(f"{OLLAMA_BASE_URL}/api/tags")
             if response.status_code != 200:
                 raise HTTPException(status_code=500, detail="Ollama not reachable")
             
@@ -117,10 +123,11 @@ async def chat_completions(
         # Call Ollama API
         async with httpx.AsyncClient(timeout=120.0) as client:
             # Ollama uses /api/chat endpoint (not /v1/chat/completions)
-            response = await client.post(
-                f"{OLLAMA_BASE_URL}/api/chat",
-                json=ollama_payload
-            )
+            with upstream_call("ollama"), stage("ollama"):
+                response = await client.post(
+                    f"{OLLAMA_BASE_URL}/api/chat",
+                    json=ollama_payload
+                )
             
             if response.status_code != 200:
                 raise HTTPException(